@@ -5,28 +5,210 @@ Converts audio files to text with optional summarization
 Uses Gemini 2.5 Flash model
 """
 import argparse
+import asyncio
+import contextlib
+import datetime
+import difflib
+import hashlib
+import json
+import logging
+import math
+import mmap
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Any
+from types import MappingProxyType
+from typing import Optional, Any, Dict, Iterator, List, NamedTuple, TextIO, Union
+import httpx
 import google.generativeai as genai
+from google.generativeai import caching
 from google.api_core import exceptions as gcp_exceptions
 from pydub import AudioSegment
 import tempfile
 import re
+import sqlite3
+import stat
+import subprocess
+
+log = logging.getLogger(__name__)
 
 # Constants
-SUPPORTED_FORMATS = ['.mp3', '.wav', '.aac', '.flac', '.m4a', '.ogg', '.aiff']
+MIME_TYPES = MappingProxyType({
+    '.mp3': 'audio/mp3',
+    '.wav': 'audio/wav',
+    '.aac': 'audio/aac',
+    '.flac': 'audio/flac',
+    '.m4a': 'audio/mp4',
+    '.ogg': 'audio/ogg',
+    '.aiff': 'audio/aiff'
+})
+SUPPORTED_FORMATS = tuple(MIME_TYPES)
 MAX_FILE_SIZE_MB = 20
+TIME_PATTERN = re.compile(r'(\d+):([0-5]?\d)')
 MODEL_NAME = 'gemini-2.5-flash'
+API_BASE_URL = 'https://generativelanguage.googleapis.com'
+UPLOAD_TIMEOUT_SECONDS = 300
+UPLOAD_MAX_RETRIES = 3
+# Backoff before each upload retry, one delay per attempt
+UPLOAD_RETRY_DELAYS = (1, 2, 4)
+DEFAULT_UPLOAD_CHUNK_MB = 8
+DEFAULT_MAX_CONCURRENCY = 4
+# Backoff between file state polls; the last delay repeats
+UPLOAD_POLL_DELAYS = (0.25, 0.5, 1, 2)
+TRANSCRIBE_PROMPT = "Generate a transcript of the speech. Include all spoken content accurately."
+SUMMARY_PROMPT = """Please provide a concise summary of the following text.
+Include the main points and key information.
+Text to summarize:"""
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'mp3_to_text')
+CONTEXT_CACHE_TTL = datetime.timedelta(hours=1)
+# Gemini rejects cached content below this many tokens
+CONTEXT_CACHE_MIN_TOKENS = 1024
+DEFAULT_CACHE_MAX_MB = 256
+# Finish reasons for a response that ended normally (not blocked)
+COMPLETE_FINISH_REASONS = {'STOP', 'MAX_TOKENS'}
+BATCH_POLL_SECONDS = 30
+CHUNK_OVERLAP_SECONDS = 5
+# Characters compared at each chunk boundary when stitching transcripts
+STITCH_WINDOW_CHARS = 200
+STITCH_MIN_MATCH_CHARS = 20
+BATCH_DONE_STATES = {'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED',
+                     'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'}
+
+class BatchTask(NamedTuple):
+    """A single audio file submitted as part of a batch job."""
+    key: str
+    path: str
+
+@contextlib.contextmanager
+def atomic_write(path: str) -> Iterator[TextIO]:
+    """Open a temporary file for writing and move it over path when done.
+
+    The data is fsynced before the rename, so path either keeps its old
+    content or has the complete new content, even if the process dies
+    mid-write.
+    """
+    temp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class ContextCacheRegistry:
+    """On-disk JSON map of prompt hashes to Gemini cached content names.
+
+    Lets cached content be reused across process restarts until it expires.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached content name for key, if not yet expired."""
+        entry = self.entries.get(key)
+        if entry and entry['expires'] > time.time():
+            return entry['name']
+        return None
+
+    def put(self, key: str, name: str, ttl: datetime.timedelta):
+        """Record a cached content name and persist the registry."""
+        self.entries[key] = {'name': name, 'expires': time.time() + ttl.total_seconds()}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with atomic_write(self.path) as f:
+            json.dump(self.entries, f)
+
+class TranscriptCache:
+    """Persistent LRU cache of transcripts keyed by audio content hash."""
+    def __init__(self, cache_dir: str, max_size_mb: float = DEFAULT_CACHE_MAX_MB):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'transcripts.sqlite3'))
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS transcripts ('
+                'key TEXT PRIMARY KEY, transcript TEXT NOT NULL, '
+                'size INTEGER NOT NULL, accessed REAL NOT NULL)'
+            )
+
+    @staticmethod
+    def make_key(audio_hash: str, prompt_variant: str) -> str:
+        """Build a cache key from the audio hash, model and prompt settings."""
+        return hashlib.blake2b(
+            f"{audio_hash}\0{MODEL_NAME}\0{prompt_variant}".encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached transcript for key, or None on a miss."""
+        row = self.conn.execute(
+            'SELECT transcript FROM transcripts WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        with self.conn:
+            self.conn.execute(
+                'UPDATE transcripts SET accessed = ? WHERE key = ?', (time.time(), key)
+            )
+        return row[0]
+
+    def put(self, key: str, transcript: str):
+        """Store a transcript and evict least recently used entries."""
+        size = len(transcript.encode('utf-8'))
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO transcripts (key, transcript, size, accessed) '
+                'VALUES (?, ?, ?, ?)', (key, transcript, size, time.time())
+            )
+            total = self.conn.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM transcripts'
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                rows = self.conn.execute(
+                    'SELECT key, size FROM transcripts ORDER BY accessed'
+                ).fetchall()
+                for old_key, old_size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self.conn.execute('DELETE FROM transcripts WHERE key = ?', (old_key,))
+                    total -= old_size
+
+    def close(self):
+        self.conn.close()
 
 class AudioTranscriber:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, use_cache: bool = True,
+                 cache_dir: str = CACHE_DIR, show_tokens: bool = False,
+                 upload_chunk_mb: float = DEFAULT_UPLOAD_CHUNK_MB,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
         """Initialize the transcriber with Gemini API key."""
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.upload_chunk_mb = upload_chunk_mb
+        self.show_tokens = show_tokens
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(MODEL_NAME)
-        print(f"Initialized with model: {MODEL_NAME}")
+        self.use_cache = use_cache
+        self.context_registry = None
+        if use_cache:
+            self.context_registry = ContextCacheRegistry(
+                os.path.join(cache_dir, 'context_cache.json')
+            )
+        self._cached_models = {}
+        self._instruction_models = {}
+        self._cache_lock = threading.Lock()
+        log.info("Initialized with model: %s", MODEL_NAME)
 
     def check_api_enabled(self):
         """Check if the Generative Language API is enabled."""
@@ -36,87 +218,261 @@ class AudioTranscriber:
             return True
         except gcp_exceptions.PermissionDenied as e:
             if "API has not been enabled" in str(e):
-                print(f"Error: The Generative Language API is not enabled for your Google Cloud project.")
-                print("Please enable it using one of the following methods:")
-                print("1. Google Cloud Console:")
-                print("   - Go to https://console.cloud.google.com/apis/library/generativelanguage.googleapis.com")
-                print("   - Select your project and click 'Enable'")
-                print("2. gcloud CLI:")
-                print("   - Run: gcloud services enable generativelanguage.googleapis.com")
-                print("Ensure your API key has the necessary permissions and is associated with the correct project.")
+                log.error("Error: The Generative Language API is not enabled for your Google Cloud project.")
+                log.error("Please enable it using one of the following methods:")
+                log.error("1. Google Cloud Console:")
+                log.error("   - Go to https://console.cloud.google.com/apis/library/generativelanguage.googleapis.com")
+                log.error("   - Select your project and click 'Enable'")
+                log.error("2. gcloud CLI:")
+                log.error("   - Run: gcloud services enable generativelanguage.googleapis.com")
+                log.error("Ensure your API key has the necessary permissions and is associated with the correct project.")
                 return False
             raise e
         except Exception as e:
-            print(f"Error checking API status: {e}")
+            log.error("Error checking API status: %s", e)
             return False
 
     def parse_time(self, time_str: str) -> int:
         """Convert MM:SS format to milliseconds."""
-        try:
-            parts = time_str.split(':')
-            if len(parts) != 2:
-                raise ValueError
-            minutes = int(parts[0])
-            seconds = int(parts[1])
-            return (minutes * 60 + seconds) * 1000
-        except (ValueError, IndexError):
+        match = TIME_PATTERN.fullmatch(time_str)
+        if not match:
             raise ValueError(f"Invalid time format: {time_str}. Use MM:SS format.")
+        return (int(match[1]) * 60 + int(match[2])) * 1000
+
+    def format_time(self, ms: int) -> str:
+        """Convert milliseconds to HH:MM:SS.mmm format for ffmpeg."""
+        total_seconds, millis = divmod(ms, 1000)
+        hours, remainder = divmod(total_seconds, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}"
 
     def trim_audio(self, input_file: str, start_time: Optional[str] = None,
-                   end_time: Optional[str] = None) -> str:
-        """Trim audio file if start/end times are specified."""
+                   end_time: Optional[str] = None,
+                   sample_accurate: bool = False) -> str:
+        """Trim audio file if start/end times are specified.
+
+        By default the selected range is stream-copied with ffmpeg, which cuts
+        on the nearest frame boundary without decoding. With sample_accurate
+        the whole file is decoded and re-encoded with pydub instead.
+        """
         if not start_time and not end_time:
             return input_file
-        print(f"Trimming audio file...")
-        audio = AudioSegment.from_file(input_file)
+        log.info("Trimming audio file...")
+        if sample_accurate:
+            audio = AudioSegment.from_file(input_file)
+            audio_ms = len(audio)
+        else:
+            audio_ms = int(probe_duration(input_file) * 1000)
         start_ms = self.parse_time(start_time) if start_time else 0
-        end_ms = self.parse_time(end_time) if end_time else len(audio)
+        end_ms = self.parse_time(end_time) if end_time else audio_ms
         if start_ms >= end_ms:
             raise ValueError("Start time must be before end time")
-        if start_ms > len(audio):
+        if start_ms > audio_ms:
             raise ValueError("Start time exceeds audio duration")
-        trimmed = audio[start_ms:end_ms]
-        # Save trimmed audio to temporary file
-        temp_file = tempfile.NamedTemporaryFile(suffix='.mp3', delete=False)
-        trimmed.export(temp_file.name, format='mp3')
-        temp_file.close()
+        if sample_accurate:
+            trimmed = audio[start_ms:end_ms]
+            # Save trimmed audio to temporary file, exporting through the open descriptor
+            fd, temp_path = tempfile.mkstemp(suffix='.mp3')
+            with os.fdopen(fd, 'wb') as out:
+                trimmed.export(out, format='mp3')
+        else:
+            # Without an end time, copy through to the end of the input
+            temp_path = self.copy_segment(input_file, start_ms,
+                                          end_ms - start_ms if end_time else None)
         duration = (end_ms - start_ms) / 1000
-        print(f"Audio trimmed: {duration:.1f} seconds")
+        log.info("Audio trimmed: %.1f seconds", duration)
+        return temp_path
+
+    def copy_segment(self, input_file: str, start_ms: int,
+                     duration_ms: Optional[int] = None) -> str:
+        """Stream-copy part of an audio file to a temporary file with ffmpeg.
+
+        Copies to the end of the input if duration_ms is None.
+        """
+        # Keep the container format so the streams can be copied as-is
+        suffix = os.path.splitext(input_file)[1].lower()
+        temp_file = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+        temp_file.close()
+        # -ss/-t before -i seek the input without decoding the skipped audio
+        command = ['ffmpeg', '-hide_banner', '-loglevel', 'error',
+                   '-ss', self.format_time(start_ms)]
+        if duration_ms is not None:
+            command += ['-t', self.format_time(duration_ms)]
+        command += ['-i', input_file, '-c', 'copy', '-y', temp_file.name]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            os.remove(temp_file.name)
+            raise Exception(f"ffmpeg failed to trim audio: {result.stderr.strip()}")
         return temp_file.name
 
-    def upload_file(self, file_path: str) -> Any:
-        """Upload file to Gemini Files API."""
-        file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-        print(f"Uploading file: {os.path.basename(file_path)} ({file_size_mb:.2f} MB)")
-        # Upload the file
-        uploaded_file = genai.upload_file(
-            path=file_path,
-            display_name=os.path.basename(file_path)
+    def split_audio(self, input_file: str, segments: int,
+                    overlap_seconds: int = CHUNK_OVERLAP_SECONDS) -> List[str]:
+        """Split an audio file into overlapping segments of equal length.
+
+        Each segment after the first starts overlap_seconds early so sentences
+        cut at a boundary appear in full in one of the two transcripts.
+        """
+        duration_s = probe_duration(input_file)
+        window_s = max(1, math.ceil(duration_s / segments))
+        # Very short inputs: keep segments from collapsing onto the same start
+        overlap_seconds = min(overlap_seconds, window_s // 2)
+        segment_paths = []
+        try:
+            for i in range(segments):
+                start_s = max(0, i * window_s - overlap_seconds)
+                end_s = (i + 1) * window_s
+                if start_s >= duration_s:
+                    break
+                # The last segment runs to the end of the input
+                last = i == segments - 1 or end_s >= duration_s
+                segment_paths.append(self.copy_segment(
+                    input_file, start_s * 1000,
+                    None if last else (end_s - start_s) * 1000
+                ))
+                if last:
+                    break
+        except Exception:
+            for segment_path in segment_paths:
+                os.remove(segment_path)
+            raise
+        log.info("Audio split into %s segments of ~%s seconds", len(segment_paths), window_s)
+        return segment_paths
+
+    def upload_client(self) -> httpx.AsyncClient:
+        """Create an HTTP client for file uploads, to be shared across uploads.
+
+        Concurrent uploads through one client are multiplexed over a single
+        HTTP/2 connection.
+        """
+        transport = httpx.AsyncHTTPTransport(retries=UPLOAD_MAX_RETRIES, http2=True)
+        return httpx.AsyncClient(timeout=UPLOAD_TIMEOUT_SECONDS, transport=transport)
+
+    async def upload_file_async(self, file_path: str,
+                                client: Optional[httpx.AsyncClient] = None) -> Any:
+        """Upload file to Gemini Files API without blocking the event loop.
+
+        Pass a client from upload_client() to reuse its connections.
+        """
+        if client is None:
+            async with self.upload_client() as client:
+                return await self.upload_file_async(file_path, client)
+        # The file is read after the session start round trip; read ahead meanwhile
+        prefetch_file(file_path)
+        file_size = os.path.getsize(file_path)
+        log.info("Uploading file: %s (%.2f MB)", os.path.basename(file_path), file_size / (1024 * 1024))
+        mime_type = MIME_TYPES.get(os.path.splitext(file_path)[1].lower(), 'audio/mp3')
+        headers = {'x-goog-api-key': self.api_key}
+        # Start a resumable upload session
+        response = await client.post(
+            f"{API_BASE_URL}/upload/v1beta/files",
+            headers={
+                **headers,
+                'X-Goog-Upload-Protocol': 'resumable',
+                'X-Goog-Upload-Command': 'start',
+                'X-Goog-Upload-Header-Content-Length': str(file_size),
+                'X-Goog-Upload-Header-Content-Type': mime_type
+            },
+            json={'file': {'display_name': os.path.basename(file_path)}}
         )
+        response.raise_for_status()
+        upload_url = response.headers['x-goog-upload-url']
+        # Chunks must be a multiple of the server's granularity
+        granularity = int(response.headers.get('x-goog-upload-chunk-granularity', 1))
+        chunk_size = int(self.upload_chunk_mb * 1024 * 1024)
+        chunk_size = max(granularity, chunk_size - chunk_size % granularity)
+        # Upload the file in chunks, resuming from the server's offset on failure
+        file_info = None
+        offset = 0
+        failures = 0
+        with open(file_path, 'rb') as f:
+            while file_info is None:
+                f.seek(offset)
+                data = await asyncio.to_thread(f.read, chunk_size)
+                final = offset + len(data) >= file_size
+                try:
+                    response = await client.post(
+                        upload_url,
+                        headers={
+                            'X-Goog-Upload-Offset': str(offset),
+                            'X-Goog-Upload-Command': 'upload, finalize' if final else 'upload'
+                        },
+                        content=data
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError as e:
+                    error = e
+                    # Back off, then ask the server how much it received; a failed
+                    # query counts as another failed attempt
+                    while True:
+                        failures += 1
+                        if failures > UPLOAD_MAX_RETRIES:
+                            raise error
+                        log.warning("Warning: Upload chunk failed (%s), resuming...", error)
+                        await asyncio.sleep(UPLOAD_RETRY_DELAYS[failures - 1])
+                        try:
+                            response = await client.post(
+                                upload_url, headers={'X-Goog-Upload-Command': 'query'}
+                            )
+                            response.raise_for_status()
+                        except httpx.HTTPError as e:
+                            error = e
+                            continue
+                        offset = int(response.headers['x-goog-upload-size-received'])
+                        break
+                    continue
+                if final:
+                    file_info = response.json()['file']
+                else:
+                    offset += len(data)
         # Wait for file processing
-        print("Waiting for file processing...")
-        while uploaded_file.state.name == "PROCESSING":
-            time.sleep(2)
-            uploaded_file = genai.get_file(uploaded_file.name)
-        if uploaded_file.state.name != "ACTIVE":
-            raise Exception(f"File upload failed with state: {uploaded_file.state.name}")
-        print(f"File uploaded successfully: {uploaded_file.uri}")
+        log.info("Waiting for file processing...")
+        delays = iter(UPLOAD_POLL_DELAYS)
+        while file_info['state'] == 'PROCESSING':
+            await asyncio.sleep(next(delays, UPLOAD_POLL_DELAYS[-1]))
+            response = await client.get(
+                f"{API_BASE_URL}/v1beta/{file_info['name']}", headers=headers
+            )
+            response.raise_for_status()
+            file_info = response.json()
+        if file_info['state'] != 'ACTIVE':
+            raise Exception(f"File upload failed with state: {file_info['state']}")
+        uploaded_file = await asyncio.to_thread(genai.get_file, file_info['name'])
+        log.info("File uploaded successfully: %s", uploaded_file.uri)
         return uploaded_file
 
+    def upload_file(self, file_path: str) -> Any:
+        """Upload file to Gemini Files API."""
+        return asyncio.run(self.upload_file_async(file_path))
+
+    def upload_files(self, paths: List[str]) -> List[Any]:
+        """Upload several files to Gemini Files API concurrently.
+
+        At most max_concurrency uploads run at once, over one shared client.
+        """
+        async def upload_all():
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with self.upload_client() as client:
+                async def upload(file_path):
+                    async with semaphore:
+                        return await self.upload_file_async(file_path, client)
+                return await asyncio.gather(
+                    *(upload(file_path) for file_path in paths),
+                    return_exceptions=True
+                )
+        results = asyncio.run(upload_all())
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            # Don't leave the successful uploads behind
+            for uploaded_file in results:
+                if not isinstance(uploaded_file, BaseException):
+                    self.cleanup_file(uploaded_file)
+            raise errors[0]
+        return results
+
     def process_inline(self, file_path: str) -> dict:
         """Process small audio files inline."""
-        print("Processing audio inline...")
-        mime_types = {
-            '.mp3': 'audio/mp3',
-            '.wav': 'audio/wav',
-            '.aac': 'audio/aac',
-            '.flac': 'audio/flac',
-            '.m4a': 'audio/mp4',
-            '.ogg': 'audio/ogg',
-            '.aiff': 'audio/aiff'
-        }
-        ext = Path(file_path).suffix.lower()
-        mime_type = mime_types.get(ext, 'audio/mp3')
+        log.info("Processing audio inline...")
+        mime_type = MIME_TYPES.get(os.path.splitext(file_path)[1].lower(), 'audio/mp3')
         with open(file_path, 'rb') as f:
             audio_bytes = f.read()
         # Return a dictionary for inline audio data
@@ -133,62 +489,322 @@ class AudioTranscriber:
             response = self.model.count_tokens(content)
             return response.total_tokens
         except Exception as e:
-            print(f"Warning: Could not count tokens: {e}")
+            log.warning("Warning: Could not count tokens: %s", e)
             return 0
 
+    def cached_model(self, prompt: str,
+                     system_instruction: Optional[str] = None) -> Optional[Any]:
+        """Return a model bound to cached content for a static prompt.
+
+        Returns None when caching is disabled or the prompt is too short for
+        Gemini to accept it as cached content.
+        """
+        if not self.use_cache:
+            return None
+        key = hashlib.sha256(
+            f"{MODEL_NAME}\0{system_instruction or ''}\0{prompt}".encode('utf-8')
+        ).hexdigest()
+        # Workers from --parallel-chunks and --concurrent call this at the same
+        # time; without the lock each would create its own (billed) cache
+        with self._cache_lock:
+            if key in self._cached_models:
+                return self._cached_models[key]
+            model = None
+            # Rough local estimate (~4 characters per token) to skip doomed requests
+            if (len(prompt) + len(system_instruction or '')) // 4 >= CONTEXT_CACHE_MIN_TOKENS:
+                cached = None
+                name = self.context_registry.get(key)
+                if name:
+                    try:
+                        cached = caching.CachedContent.get(name)
+                    except Exception:
+                        # Expired or deleted server-side; create a new one
+                        cached = None
+                if cached is None:
+                    try:
+                        cached = caching.CachedContent.create(
+                            model=MODEL_NAME,
+                            system_instruction=system_instruction,
+                            contents=[prompt],
+                            ttl=CONTEXT_CACHE_TTL
+                        )
+                        self.context_registry.put(key, cached.name, CONTEXT_CACHE_TTL)
+                        log.info("Created cached content: %s", cached.name)
+                    except Exception as e:
+                        log.warning("Warning: Could not create cached content: %s", e)
+                if cached is not None:
+                    model = genai.GenerativeModel.from_cached_content(cached_content=cached)
+            self._cached_models[key] = model
+            return model
+
+    def model_for(self, system_instruction: Optional[str] = None) -> Any:
+        """Return a model for the given system instruction, reusing instances."""
+        if not system_instruction:
+            return self.model
+        with self._cache_lock:
+            if system_instruction not in self._instruction_models:
+                self._instruction_models[system_instruction] = genai.GenerativeModel(
+                    MODEL_NAME,
+                    system_instruction=system_instruction
+                )
+            return self._instruction_models[system_instruction]
+
     def transcribe(self, audio_content,
                    system_instruction: Optional[str] = None,
                    use_timestamps: bool = False,
                    start_time: Optional[str] = None,
-                   end_time: Optional[str] = None) -> str:
-        """Transcribe audio file to text."""
+                   end_time: Optional[str] = None,
+                   output: Optional[TextIO] = None,
+                   collect: Optional[List[str]] = None) -> Union[str, int]:
+        """Transcribe audio file to text.
+
+        If output is given, the response is streamed and written (and
+        flushed) to it as chunks arrive, and the number of characters written
+        is returned; chunks are also appended to collect if provided.
+        Otherwise the full transcription is returned.
+        """
         # Build the prompt
         if use_timestamps and start_time and end_time:
             prompt = f"Provide a transcript of the speech from {start_time} to {end_time}."
         else:
-            prompt = "Generate a transcript of the speech. Include all spoken content accurately."
-        contents = [prompt, audio_content]
+            prompt = TRANSCRIBE_PROMPT
+        # Prompt and system instruction are served from cached content if possible
+        cached_model = self.cached_model(prompt, system_instruction)
+        if cached_model:
+            contents = [audio_content]
+        else:
+            contents = [prompt, audio_content]
         # Count and display input tokens
-        token_count = self.count_tokens(contents)
-        if token_count > 0:
-            print(f"Input tokens: {token_count}")
-        print(f"Transcribing audio using {MODEL_NAME}...")
+        # Skip the count_tokens request when its output would not be shown
+        if self.show_tokens and log.isEnabledFor(logging.INFO):
+            token_count = self.count_tokens(contents)
+            if token_count > 0:
+                log.info("Input tokens: %s", token_count)
+        log.info("Transcribing audio using %s...", MODEL_NAME)
         # Configure generation
         generation_config = genai.GenerationConfig(
             temperature=0.1,
             max_output_tokens=8192,
         )
         # Use system instruction if provided
-        if system_instruction:
-            model = genai.GenerativeModel(
-                MODEL_NAME,
-                system_instruction=system_instruction
+        model = cached_model or self.model_for(system_instruction)
+        if output is None:
+            response = model.generate_content(
+                contents,
+                generation_config=generation_config
             )
-        else:
-            model = self.model
+            return response.text
         response = model.generate_content(
             contents,
-            generation_config=generation_config
+            generation_config=generation_config,
+            stream=True
         )
-        return response.text
+        written = 0
+        for chunk in response:
+            # The final chunk may carry only the finish reason
+            if chunk.parts:
+                text = chunk.text
+                output.write(text)
+                output.flush()
+                written += len(text)
+                if collect is not None:
+                    collect.append(text)
+        # Like response.text on the buffered path, fail on blocked or cut-off
+        # responses so a partial file is discarded instead of saved and cached
+        if response.candidates:
+            finish_reason = response.candidates[0].finish_reason.name
+        else:
+            finish_reason = f"blocked ({response.prompt_feedback})"
+        if finish_reason not in COMPLETE_FINISH_REASONS or not written:
+            raise ValueError(f"Transcription did not complete (finish reason: {finish_reason})")
+        return written
+
+    def transcribe_chunks(self, file_path: str, segments: int,
+                          system_instruction: Optional[str] = None,
+                          keep_uploaded: bool = False) -> str:
+        """Split long audio into segments, transcribe them in parallel and stitch."""
+        segment_paths = self.split_audio(file_path, segments)
+        uploaded = {}
+        try:
+            # Segments too large to send inline are uploaded together up front,
+            # so they share one client and connection
+            large_paths = [segment_path for segment_path in segment_paths
+                           if os.path.getsize(segment_path) / (1024 * 1024) >= MAX_FILE_SIZE_MB]
+            if large_paths:
+                uploaded = dict(zip(large_paths, self.upload_files(large_paths)))
+
+            def transcribe_segment(segment_path):
+                if segment_path in uploaded:
+                    audio_content = uploaded[segment_path]
+                else:
+                    audio_content = self.process_inline(segment_path)
+                return self.transcribe(audio_content, system_instruction=system_instruction)
+
+            with ThreadPoolExecutor(max_workers=len(segment_paths)) as executor:
+                transcripts = list(executor.map(transcribe_segment, segment_paths))
+        finally:
+            if not keep_uploaded:
+                for uploaded_file in uploaded.values():
+                    self.cleanup_file(uploaded_file)
+            for segment_path in segment_paths:
+                if os.path.exists(segment_path):
+                    os.remove(segment_path)
+        return stitch_transcripts(transcripts)
+
+    def transcribe_batch(self, tasks: List[BatchTask],
+                         system_instruction: Optional[str] = None,
+                         keep_uploaded: bool = False) -> Dict[str, str]:
+        """Transcribe many audio files with a single Gemini Batch API job.
+
+        Batch jobs run asynchronously at a reduced price, so this is meant for
+        latency-tolerant workloads. Returns a mapping of task key to transcript.
+        """
+        # The Batch API is only exposed by the newer google-genai SDK
+        from google import genai as genai_client
+        client = genai_client.Client(api_key=self.api_key)
+        uploaded_files = []
+        batch_input = None
+        job = None
+        jsonl_path = None
+        try:
+            uploaded_files = self.upload_files([task.path for task in tasks])
+            with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False,
+                                             encoding='utf-8') as f:
+                jsonl_path = f.name
+                for task, uploaded_file in zip(tasks, uploaded_files):
+                    request = {
+                        'contents': [{
+                            'role': 'user',
+                            'parts': [
+                                {'text': TRANSCRIBE_PROMPT},
+                                {'file_data': {
+                                    'file_uri': uploaded_file.uri,
+                                    'mime_type': uploaded_file.mime_type
+                                }}
+                            ]
+                        }],
+                        'generation_config': {
+                            'temperature': 0.1,
+                            'max_output_tokens': 8192
+                        }
+                    }
+                    if system_instruction:
+                        request['system_instruction'] = {
+                            'parts': [{'text': system_instruction}]
+                        }
+                    f.write(json.dumps({'key': task.key, 'request': request}) + '\n')
+            batch_input = client.files.upload(
+                file=jsonl_path,
+                config={'display_name': 'mp3-to-text-batch-input', 'mime_type': 'jsonl'}
+            )
+            job = client.batches.create(
+                model=MODEL_NAME,
+                src=batch_input.name,
+                config={'display_name': f"mp3-to-text-{len(tasks)}-files"}
+            )
+            log.info("Batch job created: %s", job.name)
+            log.info("Waiting for batch job to complete...")
+            while job.state.name not in BATCH_DONE_STATES:
+                time.sleep(BATCH_POLL_SECONDS)
+                job = client.batches.get(name=job.name)
+                log.debug("Batch job state: %s", job.state.name)
+            if job.state.name != 'JOB_STATE_SUCCEEDED':
+                raise Exception(f"Batch job failed with state: {job.state.name}")
+            results = {}
+            raw = client.files.download(file=job.dest.file_name)
+            for line in raw.decode('utf-8').splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                text = batch_response_text(entry)
+                if text is not None:
+                    results[entry['key']] = text
+                else:
+                    # Blocked or empty responses carry a finish reason instead of text
+                    error = entry.get('error') or entry.get('response')
+                    log.warning("Warning: Batch request %s failed: %s", entry.get('key'), error)
+            return results
+        finally:
+            if jsonl_path and os.path.exists(jsonl_path):
+                os.remove(jsonl_path)
+            # Interrupted or failed while waiting: stop the job before its inputs go
+            if job is not None and job.state.name not in BATCH_DONE_STATES:
+                try:
+                    client.batches.cancel(name=job.name)
+                    log.warning("Cancelled batch job: %s", job.name)
+                except Exception as e:
+                    log.warning("Warning: Could not cancel batch job %s: %s", job.name, e)
+            if batch_input is not None:
+                try:
+                    client.files.delete(name=batch_input.name)
+                except Exception as e:
+                    log.warning("Warning: Could not delete batch input file: %s", e)
+            if not keep_uploaded:
+                for uploaded_file in uploaded_files:
+                    self.cleanup_file(uploaded_file)
+
+    async def _pipeline(self, file_path: str, client: httpx.AsyncClient,
+                        system_instruction: Optional[str] = None,
+                        keep_uploaded: bool = False) -> str:
+        """Upload and transcribe a single file."""
+        uploaded_file = await self.upload_file_async(file_path, client)
+        try:
+            return await asyncio.to_thread(
+                self.transcribe, uploaded_file, system_instruction=system_instruction
+            )
+        finally:
+            if not keep_uploaded:
+                await asyncio.to_thread(self.cleanup_file, uploaded_file)
+
+    def transcribe_many(self, paths: List[str],
+                        system_instruction: Optional[str] = None,
+                        keep_uploaded: bool = False) -> Dict[str, str]:
+        """Upload and transcribe several files concurrently.
+
+        At most max_concurrency files are in flight at once, which bounds
+        memory use and keeps requests within API rate limits. Returns a
+        mapping of file path to transcript; failed files are reported and
+        left out.
+        """
+        async def run_all():
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with self.upload_client() as client:
+                async def run_one(file_path):
+                    async with semaphore:
+                        return await self._pipeline(file_path, client,
+                                                    system_instruction, keep_uploaded)
+                return await asyncio.gather(
+                    *(run_one(file_path) for file_path in paths),
+                    return_exceptions=True
+                )
+        results = {}
+        for file_path, result in zip(paths, asyncio.run(run_all())):
+            if isinstance(result, BaseException):
+                log.warning("Warning: Could not transcribe %s: %s", file_path, result)
+            else:
+                results[file_path] = result
+        return results
 
     def summarize(self, text: str) -> str:
         """Create a summary of the transcribed text."""
-        prompt = f"""Please provide a concise summary of the following text.
-        Include the main points and key information.
-        Text to summarize:
-        {text}
-        """
+        cached_model = self.cached_model(SUMMARY_PROMPT)
+        if cached_model:
+            model = cached_model
+            prompt = text
+        else:
+            model = self.model
+            prompt = f"{SUMMARY_PROMPT}\n{text}\n"
         # Count and display input tokens
-        token_count = self.count_tokens(prompt)
-        if token_count > 0:
-            print(f"Summary input tokens: {token_count}")
-        print(f"Generating summary using {MODEL_NAME}...")
+        if self.show_tokens:
+            # Text-only input, so a local estimate (~4 characters per token)
+            # avoids a count_tokens round trip
+            log.info("Summary input tokens (estimated): %s", len(prompt) // 4)
+        log.info("Generating summary using %s...", MODEL_NAME)
         generation_config = genai.GenerationConfig(
             temperature=0.3,
             max_output_tokens=2048,
         )
-        response = self.model.generate_content(
+        response = model.generate_content(
             prompt,
             generation_config=generation_config
         )
@@ -198,21 +814,162 @@ class AudioTranscriber:
         """Delete uploaded file from Gemini."""
         try:
             genai.delete_file(file.name)
-            print(f"Cleaned up uploaded file: {file.name}")
+            log.info("Cleaned up uploaded file: %s", file.name)
         except Exception as e:
-            print(f"Warning: Could not delete uploaded file: {e}")
+            log.warning("Warning: Could not delete uploaded file: %s", e)
 
 def validate_file(file_path: str) -> float:
     """Validate input file and return size in MB."""
-    path = Path(file_path)
-    if not path.exists():
+    # A single stat call answers existence, type and size
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {file_path}")
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         raise ValueError(f"Not a file: {file_path}")
-    if path.suffix.lower() not in SUPPORTED_FORMATS:
+    # Hash lookup in the MIME map rather than a scan of SUPPORTED_FORMATS
+    if os.path.splitext(file_path)[1].lower() not in MIME_TYPES:
         raise ValueError(f"Unsupported format. Supported: {', '.join(SUPPORTED_FORMATS)}")
     # Return file size in MB
-    return path.stat().st_size / (1024 * 1024)
+    return st.st_size / (1024 * 1024)
+
+def batch_response_text(entry: dict) -> Optional[str]:
+    """Return the text of a batch result line, or None if it has none."""
+    try:
+        parts = entry['response']['candidates'][0]['content']['parts']
+        return ''.join(part['text'] for part in parts if 'text' in part) or None
+    except (KeyError, IndexError, TypeError):
+        return None
+
+def stitch_transcripts(transcripts: List[str]) -> str:
+    """Join transcripts of overlapping segments, dropping repeated text.
+
+    The end of each transcript is matched against the start of the next one;
+    if they share a long enough run of text the duplicate is removed,
+    otherwise the two are joined with a newline.
+    """
+    result = transcripts[0] if transcripts else ''
+    for transcript in transcripts[1:]:
+        tail = result[-STITCH_WINDOW_CHARS:]
+        head = transcript[:STITCH_WINDOW_CHARS]
+        match = difflib.SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(
+            0, len(tail), 0, len(head)
+        )
+        if match.size >= STITCH_MIN_MATCH_CHARS:
+            result = result[:len(result) - len(tail) + match.a] + transcript[match.b:]
+        else:
+            result = f"{result.rstrip()}\n{transcript.lstrip()}"
+    return result
+
+def probe_duration(file_path: str) -> float:
+    """Return the duration of an audio file in seconds using ffprobe."""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', file_path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"ffprobe failed to read audio duration: {result.stderr.strip()}")
+    return float(result.stdout.strip())
+
+def prefetch_file(file_path: str):
+    """Ask the kernel to start reading a file into the page cache.
+
+    The read-ahead runs asynchronously, so call this right before a network
+    round trip that precedes reading the file. No-op on platforms without
+    posix_fadvise.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def hash_file(file_path: str) -> str:
+    """Return the BLAKE2b digest of a file's contents.
+
+    The file is memory-mapped so the hash reads straight from the page cache
+    without copying the data into Python objects.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        # Empty files can't be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            digest.update(mm)
+    return digest.hexdigest()
+
+def read_file_list(list_path: str) -> List[str]:
+    """Read audio file paths from a text file, one per line."""
+    with open(list_path, 'r', encoding='utf-8') as f:
+        paths = [line.strip() for line in f]
+    # Skip blank lines and comments
+    return [p for p in paths if p and not p.startswith('#')]
+
+def run_batch(transcriber: AudioTranscriber, args: argparse.Namespace):
+    """Transcribe every file listed in args.batch.
+
+    Uses the Batch API, or concurrent direct requests with --concurrent.
+    """
+    paths = read_file_list(args.batch)
+    if not paths:
+        raise ValueError(f"No audio files listed in: {args.batch}")
+    # Drop repeated entries so each file is uploaded and keyed only once
+    unique_paths = []
+    seen = set()
+    for file_path in paths:
+        real_path = os.path.realpath(file_path)
+        if real_path in seen:
+            log.warning("Warning: Skipping duplicate entry: %s", file_path)
+            continue
+        seen.add(real_path)
+        unique_paths.append(file_path)
+    paths = unique_paths
+    # Transcripts are named after the input file, so names must not collide
+    output_names = {}
+    claimed = {}
+    for file_path in paths:
+        name = Path(file_path).stem + '.txt'
+        # Compare case-insensitively for case-insensitive filesystems
+        if name.casefold() in claimed:
+            raise ValueError(f"{claimed[name.casefold()]} and {file_path} would both be "
+                             f"saved as {name}; rename one of them")
+        claimed[name.casefold()] = file_path
+        output_names[file_path] = name
+    for file_path in paths:
+        validate_file(file_path)
+    tasks = [BatchTask(key=file_path, path=file_path) for file_path in paths]
+    if args.concurrent:
+        log.info("Transcribing %s files concurrently", len(paths))
+        results = transcriber.transcribe_many(
+            paths,
+            system_instruction=args.system_instruction,
+            keep_uploaded=args.keep_uploaded
+        )
+    else:
+        log.info("Submitting %s files as a batch job", len(paths))
+        results = transcriber.transcribe_batch(
+            tasks,
+            system_instruction=args.system_instruction,
+            keep_uploaded=args.keep_uploaded
+        )
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    for task in tasks:
+        if task.key not in results:
+            log.warning("Warning: No transcription returned for %s", task.path)
+            continue
+        output_file = os.path.join(args.output_dir, output_names[task.path])
+        with atomic_write(output_file) as f:
+            f.write(results[task.key])
+        log.info("Saved transcription: %s", output_file)
+    log.info("Batch transcribed %s/%s files", len(results), len(tasks))
 
 def main():
     parser = argparse.ArgumentParser(
@@ -224,13 +981,14 @@ Examples:
   %(prog)s input.mp3 output.txt --summary summary.txt
   %(prog)s input.mp3 output.txt --start 01:30 --end 05:45
   %(prog)s input.mp3 output.txt --inline # For small files (<20MB)
+  %(prog)s --batch files.txt --output-dir transcripts/
 Model: {MODEL_NAME}
 Supported formats: MP3, WAV, AAC, FLAC, M4A, OGG, AIFF
 Max audio length: 9.5 hours
         """
     )
-    parser.add_argument('input', help='Input audio file path')
-    parser.add_argument('output', help='Output text file path')
+    parser.add_argument('input', nargs='?', help='Input audio file path')
+    parser.add_argument('output', nargs='?', help='Output text file path')
     parser.add_argument('--api-key',
                         help='Gemini API key (or set GEMINI_API_KEY env variable)')
     parser.add_argument('--summary', metavar='FILE',
@@ -239,98 +997,256 @@ Max audio length: 9.5 hours
                         help='Start time for audio trimming')
     parser.add_argument('--end', metavar='MM:SS',
                         help='End time for audio trimming')
+    parser.add_argument('--sample-accurate', action='store_true',
+                        help='Trim by decoding and re-encoding the audio (slower) instead of '
+                             'cutting on frame boundaries with ffmpeg stream copy')
     parser.add_argument('--system-instruction',
                         help='System instruction for the model')
     parser.add_argument('--inline', action='store_true',
                         help='Process audio inline (for files <20MB)')
+    parser.add_argument('--upload-chunk-mb', type=float, default=DEFAULT_UPLOAD_CHUNK_MB,
+                        help=f'Chunk size in MB for resumable file uploads '
+                             f'(default: {DEFAULT_UPLOAD_CHUNK_MB})')
     parser.add_argument('--keep-uploaded', action='store_true',
                         help='Keep uploaded file in Gemini (don\'t delete after processing)')
+    parser.add_argument('--buffer-output', action='store_true',
+                        help='Wait for the complete transcription before writing the output file '
+                             'instead of streaming it')
+    parser.add_argument('--parallel-chunks', type=int, default=1, metavar='N',
+                        help='Split the audio into N overlapping segments and transcribe them in parallel')
     parser.add_argument('--use-timestamps', action='store_true',
                         help='Use timestamp-based transcription (requires --start and --end)')
+    parser.add_argument('--batch', metavar='FILE_LIST',
+                        help='Transcribe every audio file listed in FILE_LIST (one path per line) '
+                             'using the Gemini Batch API')
+    parser.add_argument('--output-dir', metavar='DIR', default='.',
+                        help='Directory for transcripts written in --batch mode (default: current directory)')
+    parser.add_argument('--concurrent', action='store_true',
+                        help='With --batch, transcribe files concurrently with direct requests '
+                             'instead of a Batch API job')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        metavar='N',
+                        help=f'Maximum number of files uploaded or transcribed at once in --batch mode '
+                             f'(default: {DEFAULT_MAX_CONCURRENCY})')
+    parser.add_argument('--show-tokens', action='store_true',
+                        help='Display input token counts (costs an extra API call per transcription). '
+                             'Token counts are progress messages, so this also shows progress '
+                             'in --batch --concurrent mode; not available with -q or '
+                             'Batch API jobs')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not use Gemini context caching or the local transcript cache')
+    parser.add_argument('--cache-dir', metavar='DIR', default=CACHE_DIR,
+                        help=f'Directory for cached data (default: {CACHE_DIR})')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_MB,
+                        help=f'Maximum size of the local transcript cache in MB '
+                             f'(default: {DEFAULT_CACHE_MAX_MB})')
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('-v', '--verbose', action='store_true',
+                           help='Show detailed progress messages')
+    verbosity.add_argument('-q', '--quiet', action='store_true',
+                           help='Only show errors')
     args = parser.parse_args()
+    if args.show_tokens and args.quiet:
+        parser.error('--show-tokens cannot be combined with -q')
+    if args.show_tokens and args.batch and not args.concurrent:
+        parser.error('--show-tokens requires --concurrent in --batch mode')
+    # Progress messages are shown by default for single files, not for batches;
+    # --show-tokens needs them, since token counts are logged at INFO
+    if args.quiet:
+        level = logging.ERROR
+    elif args.verbose:
+        level = logging.DEBUG
+    elif args.batch and not args.show_tokens:
+        level = logging.WARNING
+    else:
+        level = logging.INFO
+    # Configure only this script's logger so HTTP client libraries keep
+    # their default (warning) level and never log request headers
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(handler)
+    log.setLevel(level)
+    log.propagate = False
+    if args.upload_chunk_mb <= 0:
+        parser.error('--upload-chunk-mb must be positive')
+    if args.max_concurrency < 1:
+        parser.error('--max-concurrency must be at least 1')
+    if args.parallel_chunks < 1:
+        parser.error('--parallel-chunks must be at least 1')
+    if args.parallel_chunks > 1 and (args.batch or args.use_timestamps):
+        parser.error('--parallel-chunks cannot be combined with --batch or --use-timestamps')
+    if args.batch:
+        if args.input or args.output:
+            parser.error('input and output cannot be combined with --batch; use --output-dir')
+        if args.summary or args.start or args.end:
+            parser.error('--summary, --start and --end are not supported with --batch')
+    elif args.concurrent:
+        parser.error('--concurrent requires --batch')
+    elif not (args.input and args.output):
+        parser.error('input and output are required unless --batch is given')
 
     # Get API key
     api_key = args.api_key or os.environ.get('GEMINI_API_KEY')
     if not api_key:
-        print("Error: Gemini API key required. Use --api-key or set GEMINI_API_KEY environment variable.")
+        log.error("Error: Gemini API key required. Use --api-key or set GEMINI_API_KEY environment variable.")
         sys.exit(1)
 
+    if args.batch:
+        try:
+            transcriber = AudioTranscriber(api_key, use_cache=not args.no_cache,
+                                           cache_dir=args.cache_dir,
+                                           show_tokens=args.show_tokens,
+                                           upload_chunk_mb=args.upload_chunk_mb,
+                                           max_concurrency=args.max_concurrency)
+            if not transcriber.check_api_enabled():
+                sys.exit(1)
+            run_batch(transcriber, args)
+            log.info("\nProcess completed successfully using %s!", MODEL_NAME)
+        except KeyboardInterrupt:
+            log.warning("\nProcess interrupted by user")
+            sys.exit(1)
+        except Exception as e:
+            log.error("Error: %s", e)
+            sys.exit(1)
+        return
+
     temp_file = None
     uploaded_file = None
+    transcript_cache = None
     try:
         # Validate input file
         file_size_mb = validate_file(args.input)
-        print(f"Processing: {args.input} ({file_size_mb:.2f} MB)")
+        log.info("Processing: %s (%.2f MB)", args.input, file_size_mb)
+        output_path = Path(args.output)
+        streamed = False
+        # Look up a previous transcription of the same audio and settings
+        transcription = None
+        if not args.no_cache:
+            transcript_cache = TranscriptCache(args.cache_dir, args.cache_max_mb)
+            prompt_variant = json.dumps([args.system_instruction, args.use_timestamps,
+                                         args.start, args.end, args.parallel_chunks,
+                                         args.sample_accurate])
+            cache_key = TranscriptCache.make_key(hash_file(args.input), prompt_variant)
+            transcription = transcript_cache.get(cache_key)
+            if transcription is not None:
+                log.info("Using cached transcription")
         # Initialize transcriber and check API status
-        transcriber = AudioTranscriber(api_key)
-        if not transcriber.check_api_enabled():
-            sys.exit(1)
-        # Trim audio if needed (physical trimming)
-        audio_file_path = args.input
-        if args.start or args.end:
-            if not args.use_timestamps:
-                # Physical trimming
-                temp_file = transcriber.trim_audio(args.input, args.start, args.end)
-                audio_file_path = temp_file
-                file_size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
-        # Process audio based on size and preference
-        if args.inline or file_size_mb < MAX_FILE_SIZE_MB:
-            if file_size_mb >= MAX_FILE_SIZE_MB:
-                print(f"Warning: File size ({file_size_mb:.2f} MB) exceeds limit for inline processing.")
-                print("Switching to file upload method...")
-                audio_content = transcriber.upload_file(audio_file_path)
-                uploaded_file = audio_content
+        transcriber = None
+        if transcription is None and transcript_cache is None:
+            # Not read for hashing, so let the kernel read it during the API check
+            prefetch_file(args.input)
+        if transcription is None or args.summary:
+            transcriber = AudioTranscriber(api_key, use_cache=not args.no_cache,
+                                           cache_dir=args.cache_dir,
+                                           show_tokens=args.show_tokens,
+                                           upload_chunk_mb=args.upload_chunk_mb,
+                                           max_concurrency=args.max_concurrency)
+            if not transcriber.check_api_enabled():
+                sys.exit(1)
+        if transcription is None:
+            # Trim audio if needed (physical trimming)
+            audio_file_path = args.input
+            if args.start or args.end:
+                if not args.use_timestamps:
+                    # Physical trimming
+                    temp_file = transcriber.trim_audio(args.input, args.start, args.end,
+                                                       sample_accurate=args.sample_accurate)
+                    audio_file_path = temp_file
+                    file_size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
+            if args.parallel_chunks > 1:
+                # Transcribe overlapping segments concurrently
+                transcription = transcriber.transcribe_chunks(
+                    audio_file_path,
+                    args.parallel_chunks,
+                    system_instruction=args.system_instruction,
+                    keep_uploaded=args.keep_uploaded
+                )
             else:
-                audio_content = transcriber.process_inline(audio_file_path)
-        else:
-            # Upload file to Gemini
-            audio_content = transcriber.upload_file(audio_file_path)
-            uploaded_file = audio_content
-        # Transcribe audio
-        transcription = transcriber.transcribe(
-            audio_content,
-            system_instruction=args.system_instruction,
-            use_timestamps=args.use_timestamps,
-            start_time=args.start,
-            end_time=args.end
-        )
+                # Process audio based on size and preference
+                if args.inline or file_size_mb < MAX_FILE_SIZE_MB:
+                    if file_size_mb >= MAX_FILE_SIZE_MB:
+                        log.warning("Warning: File size (%.2f MB) exceeds limit for inline processing.", file_size_mb)
+                        log.warning("Switching to file upload method...")
+                        audio_content = transcriber.upload_file(audio_file_path)
+                        uploaded_file = audio_content
+                    else:
+                        audio_content = transcriber.process_inline(audio_file_path)
+                else:
+                    # Upload file to Gemini
+                    audio_content = transcriber.upload_file(audio_file_path)
+                    uploaded_file = audio_content
+                # Transcribe audio
+                if args.buffer_output:
+                    transcription = transcriber.transcribe(
+                        audio_content,
+                        system_instruction=args.system_instruction,
+                        use_timestamps=args.use_timestamps,
+                        start_time=args.start,
+                        end_time=args.end
+                    )
+                else:
+                    # Write the transcription as it is generated; progress is visible
+                    # in the temporary file until it is renamed to args.output
+                    log.info("Streaming transcription to: %s", args.output)
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    # Keep the text only if the cache or summary needs it
+                    chunks = [] if transcript_cache or args.summary else None
+                    with atomic_write(args.output) as f:
+                        output_length = transcriber.transcribe(
+                            audio_content,
+                            system_instruction=args.system_instruction,
+                            use_timestamps=args.use_timestamps,
+                            start_time=args.start,
+                            end_time=args.end,
+                            output=f,
+                            collect=chunks
+                        )
+                    streamed = True
+                    if chunks is not None:
+                        transcription = ''.join(chunks)
+            # Never cache an empty transcript; it would be returned on every rerun
+            if transcript_cache and transcription:
+                transcript_cache.put(cache_key, transcription)
         # Save transcription
-        print(f"Saving transcription to: {args.output}")
-        output_path = Path(args.output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(transcription)
-        print(f"Transcription saved successfully!")
-        print(f"Output length: {len(transcription)} characters")
+        if not streamed:
+            log.info("Saving transcription to: %s", args.output)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(args.output) as f:
+                f.write(transcription)
+            output_length = len(transcription)
+        log.info("Transcription saved successfully!")
+        log.info("Output length: %s characters", output_length)
         # Generate summary if requested
         if args.summary:
             summary = transcriber.summarize(transcription)
-            print(f"Saving summary to: {args.summary}")
+            log.info("Saving summary to: %s", args.summary)
             summary_path = Path(args.summary)
             summary_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(args.summary, 'w', encoding='utf-8') as f:
+            with atomic_write(args.summary) as f:
                 f.write(summary)
-            print(f"Summary saved successfully!")
-            print(f"Summary length: {len(summary)} characters")
+            log.info("Summary saved successfully!")
+            log.info("Summary length: %s characters", len(summary))
         # Cleanup
         if uploaded_file and not args.keep_uploaded:
             transcriber.cleanup_file(uploaded_file)
-        print(f"\nProcess completed successfully using {MODEL_NAME}!")
+        log.info("\nProcess completed successfully using %s!", MODEL_NAME)
 
     except KeyboardInterrupt:
-        print("\nProcess interrupted by user")
+        log.warning("\nProcess interrupted by user")
         sys.exit(1)
     except Exception as e:
-        print(f"Error: {e}")
+        log.error("Error: %s", e)
         sys.exit(1)
     finally:
+        if transcript_cache:
+            transcript_cache.close()
         # Clean up temporary trimmed file
         if temp_file and os.path.exists(temp_file):
             try:
                 os.remove(temp_file)
-                print("Cleaned up temporary trimmed file")
+                log.info("Cleaned up temporary trimmed file")
             except Exception as e:
-                print(f"Warning: Could not delete temporary file: {e}")
+                log.warning("Warning: Could not delete temporary file: %s", e)
 
 if __name__ == "__main__":
     main()